@@ -1,10 +1,11 @@
-from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, Header
 from app.models.schemas import (
     CreateGraphRequest, RunGraphRequest, GraphDefinition,
     WorkflowState, ExecutionLog
 )
-from app.engine.graph import graph_manager
+from app.engine.graph import graph_manager, IdempotencyKeyConflict
 from app.engine.registry import tool_registry
+from typing import Optional
 import json
 import asyncio
 
@@ -27,12 +28,20 @@ async def create_graph(request: CreateGraphRequest):
 
 
 @router.post("/run")
-async def run_graph(request: RunGraphRequest):
-    """Execute a workflow graph"""
+async def run_graph(
+    request: RunGraphRequest,
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key")
+):
+    """Execute a workflow graph
+    
+    Identical requests (same graph and initial state, or same
+    Idempotency-Key header) share one execution and its run.
+    """
     try:
-        run_id = graph_manager.run_graph(
+        run_id, deduplicated = await graph_manager.run_graph_coalesced(
             request.graph_id, 
-            request.initial_state
+            request.initial_state,
+            idempotency_key
         )
         
         run_result = graph_manager.get_run(run_id)
@@ -43,8 +52,11 @@ async def run_graph(request: RunGraphRequest):
             "status": run_result["status"],
             "final_state": run_result["final_state"],
             "execution_log": run_result["execution_log"][-10:],  # Last 10 entries
-            "iterations": run_result["iterations"]
+            "iterations": run_result["iterations"],
+            "deduplicated": deduplicated
         }
+    except IdempotencyKeyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
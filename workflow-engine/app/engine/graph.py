@@ -1,7 +1,14 @@
-from app.models.schemas import GraphDefinition, Node, Edge, RunStatus
+from app.models.schemas import GraphDefinition, Node, Edge, RunStatus, NodeType
 from app.engine.registry import tool_registry
+from app.engine.http_tool import http_tool_client
 from app.engine.state import StateManager
 from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
+import json
+import math
+import os
 import uuid
 import time
 
@@ -61,7 +68,10 @@ class WorkflowGraph:
         
         # Execute the node's function
         try:
-            result = tool_registry.execute(node.function_name, state.get_data())
+            if node.node_type == NodeType.HTTP:
+                result = http_tool_client.execute(node.config, state.get_data())
+            else:
+                result = tool_registry.execute(node.function_name, state.get_data())
             state.update(result)
             
             # Add node execution to result
@@ -145,12 +155,53 @@ class WorkflowGraph:
         }
 
 
+class IdempotencyKeyConflict(Exception):
+    """Raised when an idempotency key is reused with a different request"""
+
+
+def _consume_task_exception(task: "asyncio.Task[str]") -> None:
+    """Mark a shared execution's exception as retrieved if every caller went away"""
+    if not task.cancelled():
+        task.exception()
+
+
+def _dedup_window_from_env(default: float = 30.0) -> float:
+    """Read WORKFLOW_DEDUP_WINDOW in seconds; negative values disable result reuse"""
+    raw = os.getenv("WORKFLOW_DEDUP_WINDOW")
+    if raw is None or not raw.strip():
+        return default
+    
+    try:
+        window = float(raw)
+    except ValueError:
+        window = None
+    if window is None or math.isnan(window):
+        raise ValueError(
+            f"WORKFLOW_DEDUP_WINDOW must be a number of seconds, got {raw!r}"
+        )
+    
+    return max(window, 0.0)
+
+
 class GraphManager:
     """Manages multiple workflow graphs and runs"""
     
-    def __init__(self):
+    def __init__(self, dedup_window: float = 30.0, run_workers: int = 100):
         self.graphs: Dict[str, WorkflowGraph] = {}
         self.runs: Dict[str, Dict[str, Any]] = {}
+        
+        # Coalesced runs execute on their own threads, so nodes blocked on HTTP
+        # calls do not exhaust the event loop's default executor
+        self._executor = ThreadPoolExecutor(
+            max_workers=run_workers,
+            thread_name_prefix="workflow-run"
+        )
+        
+        # Single-flight bookkeeping: request key -> (payload_hash, execution task),
+        # and request key -> (payload_hash, run_id, completed_at) for recent runs
+        self.dedup_window = dedup_window
+        self._inflight: Dict[str, Tuple[str, "asyncio.Task[str]"]] = {}
+        self._completed: Dict[str, Tuple[str, str, float]] = {}
     
     def create_graph(self, graph_def: GraphDefinition) -> str:
         """Create a new workflow graph"""
@@ -169,12 +220,68 @@ class GraphManager:
         if not graph:
             raise ValueError(f"Graph '{graph_id}' not found")
         
-        run_id = str(uuid.uuid4())[:8]
-        
         # Execute synchronously (could be async)
         result = graph.execute(initial_state)
         
-        # Store run result
+        return self._store_run(graph_id, result)
+    
+    async def run_graph_coalesced(
+        self,
+        graph_id: str,
+        initial_state: Dict[str, Any],
+        idempotency_key: Optional[str] = None
+    ) -> Tuple[str, bool]:
+        """Execute a graph, sharing the result of identical requests.
+        
+        Requests are identified by ``idempotency_key`` when given, otherwise
+        by a canonical hash of ``graph_id`` + ``initial_state``. A duplicate
+        attaches to the in-flight execution, or gets the stored run if one
+        completed successfully within ``dedup_window`` seconds.
+        
+        Returns ``(run_id, deduplicated)``.
+        """
+        graph = self.get_graph(graph_id)
+        if not graph:
+            raise ValueError(f"Graph '{graph_id}' not found")
+        
+        payload_hash = self._payload_hash(graph_id, initial_state)
+        key = f"idem:{graph_id}:{idempotency_key}" if idempotency_key else f"hash:{payload_hash}"
+        
+        cached = self._completed.get(key)
+        if cached:
+            cached_hash, run_id, completed_at = cached
+            run = self.runs.get(run_id)
+            if (
+                time.monotonic() - completed_at <= self.dedup_window
+                and run and not self._run_failed(run)
+            ):
+                self._check_payload(idempotency_key, cached_hash, payload_hash)
+                return run_id, True
+            del self._completed[key]
+        
+        inflight = self._inflight.get(key)
+        if inflight:
+            inflight_hash, task = inflight
+            self._check_payload(idempotency_key, inflight_hash, payload_hash)
+            # shield() so a cancelled caller does not cancel the shared execution
+            return await asyncio.shield(task), True
+        
+        task = asyncio.ensure_future(
+            self._execute_and_store(graph, initial_state, key, payload_hash)
+        )
+        task.add_done_callback(_consume_task_exception)
+        self._inflight[key] = (payload_hash, task)
+        
+        return await asyncio.shield(task), False
+    
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Get run result by ID"""
+        return self.runs.get(run_id)
+    
+    def _store_run(self, graph_id: str, result: Dict[str, Any]) -> str:
+        """Store an execution result as a new run"""
+        run_id = str(uuid.uuid4())[:8]
+        
         self.runs[run_id] = {
             "run_id": run_id,
             "graph_id": graph_id,
@@ -187,10 +294,71 @@ class GraphManager:
         
         return run_id
     
-    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
-        """Get run result by ID"""
-        return self.runs.get(run_id)
+    async def _execute_and_store(
+        self,
+        graph: WorkflowGraph,
+        initial_state: Dict[str, Any],
+        key: str,
+        payload_hash: str
+    ) -> str:
+        """Run the shared execution for ``key`` and store its run"""
+        try:
+            # Run the synchronous engine off the event loop so duplicates can attach
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, graph.execute, initial_state)
+            run_id = self._store_run(graph.graph_id, result)
+        finally:
+            self._inflight.pop(key, None)
+        
+        # Failed runs are not cached so that retries execute again
+        if self.dedup_window > 0 and not self._run_failed(self.runs[run_id]):
+            self._completed[key] = (payload_hash, run_id, time.monotonic())
+        self._prune_completed()
+        
+        return run_id
+    
+    @staticmethod
+    def _run_failed(run: Dict[str, Any]) -> bool:
+        """Check whether any node of a run failed"""
+        return any("error" in entry for entry in run["execution_log"])
+    
+    @staticmethod
+    def _check_payload(
+        idempotency_key: Optional[str],
+        stored_hash: str,
+        payload_hash: str
+    ) -> None:
+        """Reject an idempotency key reused with a different request"""
+        if idempotency_key and stored_hash != payload_hash:
+            raise IdempotencyKeyConflict(
+                f"Idempotency-Key '{idempotency_key}' was already used with a different request"
+            )
+    
+    @staticmethod
+    def _payload_hash(graph_id: str, initial_state: Dict[str, Any]) -> str:
+        """Canonical hash of a run request"""
+        canonical = json.dumps(
+            {"graph_id": graph_id, "initial_state": initial_state or {}},
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    
+    def _prune_completed(self) -> None:
+        """Drop completed entries older than the de-duplication window"""
+        now = time.monotonic()
+        expired = [
+            key for key, (_, _, completed_at) in self._completed.items()
+            if now - completed_at > self.dedup_window
+        ]
+        for key in expired:
+            del self._completed[key]
 
 
 # Global graph manager instance
-graph_manager = GraphManager()
\ No newline at end of file
+# One run thread per pooled HTTP connection, so the pool size is reachable
+graph_manager = GraphManager(
+    dedup_window=_dedup_window_from_env(),
+    run_workers=http_tool_client.max_connections
+)
\ No newline at end of file
@@ -0,0 +1,286 @@
+"""
+Declarative HTTP tool for calling model and service backends.
+
+HTTP nodes (``NodeType.HTTP``) are configured entirely through ``Node.config``:
+
+    {
+        "url": "http://localhost:9000/analyze/{language}",  # formatted with state
+        "method": "POST",
+        "headers": {"Authorization": "Bearer token"},
+        "query": {"limit": "max_results"},       # request param -> state path
+        "body": {"code": "code_snippet"},        # JSON field    -> state path
+        "response": {"quality_score": "score"},  # state key     -> response path
+        "timeout": 10.0                          # seconds; null disables it
+    }
+
+Paths are dotted (``"result.items.0"``). Without a ``response`` mapping a JSON
+object response is merged into state as-is. State values substituted into the
+URL template are percent-encoded, so they cannot change its path or query.
+
+The timeout applies to the request itself. Time spent waiting for a per-host
+slot is bounded separately by ``queue_timeout`` (unbounded by default).
+
+Only hosts listed in ``WORKFLOW_HTTP_ALLOWED_HOSTS`` (comma-separated, ``*``
+for any host) may be called; with the variable unset every request is refused.
+
+All HTTP nodes share one keep-alive connection pool that lives on a background
+event loop, so workflow runs never block the API event loop and reuse
+connections across nodes and runs.
+"""
+
+from typing import Dict, Any, Iterable, Optional, Tuple
+from urllib.parse import quote, urlsplit
+import asyncio
+import concurrent.futures
+import os
+import string
+import threading
+
+import httpx
+
+
+class HttpToolError(Exception):
+    """Raised when an HTTP node is misconfigured or its request fails"""
+
+
+class _QuotingFormatter(string.Formatter):
+    """Formatter that percent-encodes every substituted value"""
+
+    def format_field(self, value: Any, format_spec: str) -> str:
+        return quote(super().format_field(value, format_spec), safe="")
+
+
+_url_formatter = _QuotingFormatter()
+
+_UNSET = object()
+
+
+def validate_timeout(value: Any) -> Optional[float]:
+    """Check a node timeout: a positive number of seconds, or None for no timeout"""
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not value > 0:
+        raise HttpToolError(
+            f"HTTP node timeout must be a positive number of seconds or null, got {value!r}"
+        )
+    return float(value)
+
+
+class HttpToolClient:
+    """Pooled async HTTP client shared by all HTTP nodes"""
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        max_per_host: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 10.0,
+        queue_timeout: Optional[float] = None,
+        allowed_hosts: Optional[Iterable[str]] = None,
+        http2: bool = False
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.max_per_host = max_per_host
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout  # max wait for a per-host slot, None = no limit
+        self.allowed_hosts = frozenset(host.lower() for host in allowed_hosts or ())
+        self.http2 = http2  # multiplexes requests per connection, needs `h2`
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limits: Dict[Tuple[str, str, Optional[int]], asyncio.Semaphore] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def execute(self, config: Dict[str, Any], state: Dict[str, Any]) -> Dict[str, Any]:
+        """Run an HTTP node from synchronous engine code"""
+        # Validate before anything is sent, so a bad config never reaches the server
+        self._request_timeout(config)
+
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self.request(config, state), loop)
+
+        # request() bounds its own waits; close() cancels it if still pending
+        try:
+            return future.result()
+        except concurrent.futures.CancelledError:
+            raise HttpToolError("HTTP node cancelled, client is closing")
+
+    async def request(self, config: Dict[str, Any], state: Dict[str, Any]) -> Dict[str, Any]:
+        """Send the request described by ``config`` and map the response to state updates"""
+        if not config.get("url"):
+            raise HttpToolError("HTTP node config requires a 'url'")
+
+        try:
+            url = _url_formatter.vformat(config["url"], (), state)
+        except KeyError as e:
+            raise HttpToolError(f"URL template references missing state key {e}")
+        except (IndexError, AttributeError, ValueError) as e:
+            raise HttpToolError(f"Invalid URL template '{config['url']}': {e}")
+
+        host = (urlsplit(url).hostname or "").lower()
+        if "*" not in self.allowed_hosts and host not in self.allowed_hosts:
+            raise HttpToolError(f"Host '{host}' is not in WORKFLOW_HTTP_ALLOWED_HOSTS")
+
+        method = config.get("method", "GET").upper()
+        params = {
+            name: _lookup(state, path)
+            for name, path in config.get("query", {}).items()
+        }
+        body = None
+        if "body" in config:
+            body = {
+                name: _lookup(state, path)
+                for name, path in config["body"].items()
+            }
+        timeout = self._request_timeout(config)
+
+        client = self._get_client()
+        limit = self._host_limit(url)
+        try:
+            await asyncio.wait_for(limit.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise HttpToolError(f"No free slot for host '{host}' within {self.queue_timeout}s")
+
+        try:
+            # The timeout starts once the slot is held, so queueing never fails a request
+            response = await asyncio.wait_for(
+                client.request(
+                    method,
+                    url,
+                    params=params or None,
+                    json=body,
+                    headers=config.get("headers"),
+                    timeout=timeout
+                ),
+                timeout
+            )
+            response.raise_for_status()
+        except asyncio.TimeoutError:
+            raise HttpToolError(f"{method} {url} timed out after {timeout}s")
+        except httpx.HTTPError as e:
+            raise HttpToolError(f"{method} {url} failed: {e}")
+        finally:
+            limit.release()
+
+        return self._map_response(config.get("response"), response)
+
+    def close(self) -> None:
+        """Close pooled connections and stop the background loop"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+
+        if not loop:
+            return
+
+        asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result()
+        self._host_limits.clear()
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    async def _shutdown(self) -> None:
+        """Cancel pending requests and close the connection pool"""
+        current = asyncio.current_task()
+        pending = [task for task in asyncio.all_tasks() if task is not current]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _request_timeout(self, config: Dict[str, Any]) -> Optional[float]:
+        """Resolve the node's timeout, falling back to the client default"""
+        value = config.get("timeout", _UNSET)
+        if value is _UNSET:
+            return self.timeout
+        return validate_timeout(value)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background event loop that owns the connection pool"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="http-tool-loop",
+                    daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Create the shared client lazily on the loop it will be used from"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry
+                ),
+                timeout=self.timeout,
+                http2=self.http2
+            )
+        return self._client
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        """Get the concurrency limit for the URL's host"""
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname or "", parts.port)
+        if key not in self._host_limits:
+            self._host_limits[key] = asyncio.Semaphore(self.max_per_host)
+        return self._host_limits[key]
+
+    @staticmethod
+    def _map_response(mapping: Optional[Dict[str, str]], response: httpx.Response) -> Dict[str, Any]:
+        """Convert a response into state updates"""
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = response.text
+
+        if not mapping:
+            if isinstance(payload, dict):
+                return payload
+            return {"response": payload}
+
+        return {
+            state_key: _lookup(payload, path)
+            for state_key, path in mapping.items()
+        }
+
+
+def _lookup(data: Any, path: str) -> Any:
+    """Resolve a dotted path against nested dicts/lists ("" is the whole value)"""
+    if not path:
+        return data
+
+    value = data
+    for part in path.split("."):
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            raise HttpToolError(f"Path '{path}' not found")
+    return value
+
+
+def _allowed_hosts_from_env() -> Tuple[str, ...]:
+    """Read the comma-separated WORKFLOW_HTTP_ALLOWED_HOSTS list"""
+    raw = os.getenv("WORKFLOW_HTTP_ALLOWED_HOSTS", "")
+    return tuple(host.strip() for host in raw.split(",") if host.strip())
+
+
+# Global HTTP tool client instance; HTTP/2 needs `pip install httpx[http2]`
+http_tool_client = HttpToolClient(
+    allowed_hosts=_allowed_hosts_from_env(),
+    http2=os.getenv("WORKFLOW_HTTP2", "").lower() in ("1", "true", "yes")
+)
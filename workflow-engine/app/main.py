@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.endpoints import router as graph_router
 from app.engine.graph import graph_manager
+from app.engine.http_tool import http_tool_client
 from app.workflows.code_review import create_code_review_workflow
 import uvicorn
 
@@ -36,6 +37,12 @@ async def startup_event():
     print(f"🔧 Available tools: {graph_manager.graphs[graph_id].graph_def.nodes.keys()}")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release pooled HTTP tool connections"""
+    http_tool_client.close()
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API info"""
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Dict, Any, List, Optional, Union
 from enum import Enum
 
@@ -8,14 +8,31 @@ class NodeType(str, Enum):
     CONDITION = "condition"
     LOOP_START = "loop_start"
     LOOP_END = "loop_end"
+    HTTP = "http"  # declarative HTTP tool, configured via Node.config
 
 
 class Node(BaseModel):
     name: str
-    function_name: str  #registered tool
+    function_name: Optional[str] = None  #registered tool (unused by HTTP nodes)
     config: Dict[str, Any] = Field(default_factory=dict)
     node_type: NodeType = NodeType.FUNCTION
 
+    @model_validator(mode="after")
+    def check_target(self) -> "Node":
+        if self.node_type == NodeType.HTTP:
+            if not self.config.get("url"):
+                raise ValueError("HTTP nodes require config['url']")
+            timeout = self.config.get("timeout")
+            if timeout is not None and (
+                isinstance(timeout, bool)
+                or not isinstance(timeout, (int, float))
+                or not timeout > 0
+            ):
+                raise ValueError("HTTP node timeout must be a positive number of seconds or null")
+        elif not self.function_name:
+            raise ValueError(f"'{self.node_type.value}' nodes require function_name")
+        return self
+
 
 class Edge(BaseModel):
     source: str
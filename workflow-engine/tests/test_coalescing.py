@@ -0,0 +1,232 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.engine.graph import GraphManager, IdempotencyKeyConflict, _dedup_window_from_env
+from app.engine.registry import tool_registry
+from app.models.schemas import GraphDefinition, Node
+
+
+calls = []
+release = threading.Event()
+
+
+def counted_tool(state):
+    calls.append(state.get("value"))
+    release.wait(timeout=5)
+    if state.get("fail"):
+        raise RuntimeError("transient failure")
+    return {"echo": state.get("value")}
+
+
+def make_manager(dedup_window=30.0):
+    manager = GraphManager(dedup_window=dedup_window)
+    graph_id = manager.create_graph(GraphDefinition(
+        nodes={"only": Node(name="Only", function_name="counted_tool")},
+        edges=[],
+        entry_point="only"
+    ))
+    return manager, graph_id
+
+
+@pytest.fixture(autouse=True)
+def reset_tool(monkeypatch):
+    monkeypatch.setitem(tool_registry._tools, "counted_tool", counted_tool)
+    calls.clear()
+    release.set()
+    yield
+    release.set()
+
+
+def test_concurrent_duplicates_share_one_execution():
+    manager, graph_id = make_manager()
+    release.clear()
+
+    async def scenario():
+        tasks = [
+            asyncio.ensure_future(manager.run_graph_coalesced(graph_id, {"value": 1}))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0.1)
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    results = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert len({run_id for run_id, _ in results}) == 1
+    assert [dedup for _, dedup in results] == [False, True, True, True, True]
+    assert len(manager.runs) == 1
+
+
+def test_completed_run_is_reused_within_window():
+    manager, graph_id = make_manager()
+
+    async def scenario():
+        first = await manager.run_graph_coalesced(graph_id, {"value": 1})
+        second = await manager.run_graph_coalesced(graph_id, {"value": 1})
+        other = await manager.run_graph_coalesced(graph_id, {"value": 2})
+        return first, second, other
+
+    first, second, other = asyncio.run(scenario())
+
+    assert first == (first[0], False)
+    assert second == (first[0], True)
+    assert other[0] != first[0] and not other[1]
+    assert len(calls) == 2
+
+
+def test_window_expiry_executes_again():
+    manager, graph_id = make_manager(dedup_window=0.05)
+
+    async def scenario():
+        first, _ = await manager.run_graph_coalesced(graph_id, {"value": 1})
+        await asyncio.sleep(0.1)
+        return first, await manager.run_graph_coalesced(graph_id, {"value": 1})
+
+    first, (second, dedup) = asyncio.run(scenario())
+
+    assert second != first and not dedup
+    assert len(calls) == 2
+    assert len(manager._completed) == 1
+
+
+def test_zero_window_disables_result_cache():
+    manager, graph_id = make_manager(dedup_window=0)
+
+    async def scenario():
+        first = await manager.run_graph_coalesced(graph_id, {"value": 1})
+        second = await manager.run_graph_coalesced(graph_id, {"value": 1})
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first[0] != second[0] and not second[1]
+    assert len(calls) == 2
+    assert manager._completed == {}
+
+
+def test_failed_runs_are_not_cached():
+    manager, graph_id = make_manager()
+
+    async def scenario():
+        first = await manager.run_graph_coalesced(graph_id, {"value": 1, "fail": True})
+        second = await manager.run_graph_coalesced(graph_id, {"value": 1, "fail": True})
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert "error" in manager.get_run(first[0])["execution_log"][0]
+    assert second[0] != first[0] and not second[1]
+    assert len(calls) == 2
+
+
+def test_idempotency_key_rejects_different_payload():
+    manager, graph_id = make_manager()
+
+    async def scenario():
+        first = await manager.run_graph_coalesced(graph_id, {"value": 1}, "key-1")
+        again = await manager.run_graph_coalesced(graph_id, {"value": 1}, "key-1")
+        with pytest.raises(IdempotencyKeyConflict):
+            await manager.run_graph_coalesced(graph_id, {"value": 2}, "key-1")
+        return first, again
+
+    first, again = asyncio.run(scenario())
+
+    assert again == (first[0], True)
+    assert len(calls) == 1
+
+
+def test_idempotency_key_conflict_while_in_flight():
+    manager, graph_id = make_manager()
+    release.clear()
+
+    async def scenario():
+        leader = asyncio.ensure_future(
+            manager.run_graph_coalesced(graph_id, {"value": 1}, "key-1")
+        )
+        await asyncio.sleep(0.05)
+        with pytest.raises(IdempotencyKeyConflict):
+            await manager.run_graph_coalesced(graph_id, {"value": 2}, "key-1")
+        release.set()
+        return await leader
+
+    run_id, dedup = asyncio.run(scenario())
+
+    assert not dedup and run_id in manager.runs
+
+
+def test_cancelled_leader_does_not_fail_followers():
+    manager, graph_id = make_manager()
+    release.clear()
+
+    async def scenario():
+        leader = asyncio.ensure_future(manager.run_graph_coalesced(graph_id, {"value": 1}))
+        await asyncio.sleep(0.05)
+        follower = asyncio.ensure_future(manager.run_graph_coalesced(graph_id, {"value": 1}))
+        await asyncio.sleep(0.05)
+        leader.cancel()
+        release.set()
+        result = await follower
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return result
+
+    run_id, dedup = asyncio.run(scenario())
+
+    assert dedup and run_id in manager.runs
+    assert len(manager.runs) == 1
+    assert len(calls) == 1
+
+
+def test_unknown_graph_raises_value_error():
+    manager, _ = make_manager()
+
+    with pytest.raises(ValueError):
+        asyncio.run(manager.run_graph_coalesced("missing", {}))
+
+
+def test_run_endpoint_idempotency_key(monkeypatch):
+    from app.main import app
+
+    manager, graph_id = make_manager()
+    monkeypatch.setattr("app.api.endpoints.graph_manager", manager)
+    client = TestClient(app)
+    url = "/graph/run"
+
+    first = client.post(url, json={"graph_id": graph_id, "initial_state": {"value": 1}},
+                        headers={"Idempotency-Key": "key-1"})
+    again = client.post(url, json={"graph_id": graph_id, "initial_state": {"value": 1}},
+                        headers={"Idempotency-Key": "key-1"})
+    conflict = client.post(url, json={"graph_id": graph_id, "initial_state": {"value": 2}},
+                           headers={"Idempotency-Key": "key-1"})
+
+    assert first.status_code == 200 and first.json()["deduplicated"] is False
+    assert again.status_code == 200 and again.json()["deduplicated"] is True
+    assert again.json()["run_id"] == first.json()["run_id"]
+    assert conflict.status_code == 422
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("raw, expected", [
+    (None, 30.0),
+    ("", 30.0),
+    ("5", 5.0),
+    ("-3", 0.0),
+])
+def test_dedup_window_from_env(monkeypatch, raw, expected):
+    if raw is None:
+        monkeypatch.delenv("WORKFLOW_DEDUP_WINDOW", raising=False)
+    else:
+        monkeypatch.setenv("WORKFLOW_DEDUP_WINDOW", raw)
+
+    assert _dedup_window_from_env() == expected
+
+
+def test_dedup_window_from_env_rejects_malformed(monkeypatch):
+    monkeypatch.setenv("WORKFLOW_DEDUP_WINDOW", "30s")
+
+    with pytest.raises(ValueError, match="WORKFLOW_DEDUP_WINDOW"):
+        _dedup_window_from_env()
@@ -0,0 +1,264 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from pydantic import ValidationError
+
+from app.engine.graph import WorkflowGraph
+from app.engine.http_tool import HttpToolClient, HttpToolError
+from app.models.schemas import GraphDefinition, Node, NodeType
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        parts = urlsplit(self.path)
+        server.requests.append({"path": parts.path, "query": parse_qs(parts.query)})
+
+        if parts.path == "/error":
+            return self._reply(503, {"detail": "unavailable"})
+
+        if parts.path == "/hang":
+            time.sleep(2)
+
+        if parts.path == "/paced":
+            time.sleep(0.4)
+
+        if parts.path == "/slow":
+            with server.lock:
+                server.active += 1
+                server.max_active = max(server.max_active, server.active)
+            time.sleep(0.1)
+            with server.lock:
+                server.active -= 1
+
+        self._reply(200, {"result": {"items": [{"score": 87}]}, "path": parts.path})
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        body = json.loads(self.rfile.read(length))
+        self.server.requests.append({"path": self.path, "body": body})
+        self._reply(200, {"length": len(body["code"])})
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.requests = []
+    server.lock = threading.Lock()
+    server.active = 0
+    server.max_active = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client():
+    client = HttpToolClient(max_per_host=2, timeout=5.0, allowed_hosts=["127.0.0.1"])
+    yield client
+    client.close()
+
+
+def test_response_mapping(stub_server, client):
+    _, base = stub_server
+    config = {
+        "url": base + "/analyze/{lang}",
+        "response": {"quality_score": "result.items.0.score", "path": "path"}
+    }
+
+    result = client.execute(config, {"lang": "py"})
+
+    assert result == {"quality_score": 87, "path": "/analyze/py"}
+
+
+def test_unmapped_json_object_is_merged(stub_server, client):
+    _, base = stub_server
+
+    result = client.execute({"url": base + "/plain"}, {})
+
+    assert result["path"] == "/plain"
+
+
+def test_query_and_body_mapping(stub_server, client):
+    server, base = stub_server
+
+    client.execute(
+        {"url": base + "/search", "query": {"limit": "options.limit"}},
+        {"options": {"limit": 3}}
+    )
+    result = client.execute(
+        {"url": base + "/review", "method": "POST", "body": {"code": "code_snippet"}},
+        {"code_snippet": "def f(): pass"}
+    )
+
+    assert server.requests[0]["query"] == {"limit": ["3"]}
+    assert server.requests[1]["body"] == {"code": "def f(): pass"}
+    assert result == {"length": 13}
+
+
+def test_url_values_are_percent_encoded(stub_server, client):
+    server, base = stub_server
+
+    client.execute({"url": base + "/analyze/{lang}"}, {"lang": "c++/../../admin?x=1#"})
+
+    assert server.requests[0]["path"] == "/analyze/c%2B%2B%2F..%2F..%2Fadmin%3Fx%3D1%23"
+    assert server.requests[0]["query"] == {}
+
+
+def test_bad_url_templates_raise_tool_error(client):
+    with pytest.raises(HttpToolError):
+        client.execute({"url": "http://127.0.0.1/{missing}"}, {})
+    with pytest.raises(HttpToolError):
+        client.execute({"url": "http://127.0.0.1/{0}"}, {})
+    with pytest.raises(HttpToolError):
+        client.execute({"url": "http://127.0.0.1/{lang.upper.x}"}, {"lang": "py"})
+    with pytest.raises(HttpToolError):
+        client.execute({"url": "http://127.0.0.1/{lang"}, {"lang": "py"})
+
+
+def test_error_status_becomes_node_failure(stub_server, monkeypatch, client):
+    _, base = stub_server
+    monkeypatch.setattr("app.engine.graph.http_tool_client", client)
+    graph = WorkflowGraph("g", GraphDefinition(
+        nodes={"call": Node(name="Call", node_type=NodeType.HTTP, config={"url": base + "/error"})},
+        edges=[],
+        entry_point="call"
+    ))
+
+    result = graph.execute({})
+
+    assert not result["execution_log"][0]["result"]
+    assert "503" in result["execution_log"][0]["error"]
+
+
+def test_per_host_limit(stub_server, client):
+    server, base = stub_server
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        list(pool.map(lambda _: client.execute({"url": base + "/slow"}, {}), range(6)))
+
+    assert len(server.requests) == 6
+    assert server.max_active == 2
+
+
+def test_queueing_for_host_slot_does_not_count_against_timeout(stub_server):
+    server, base = stub_server
+    client = HttpToolClient(max_per_host=1, timeout=0.6, allowed_hosts=["127.0.0.1"])
+
+    try:
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            results = list(pool.map(
+                lambda _: client.execute({"url": base + "/paced"}, {}), range(5)
+            ))
+    finally:
+        client.close()
+
+    assert len(results) == 5
+    assert len(server.requests) == 5
+
+
+def test_request_exceeding_timeout_fails(stub_server, client):
+    _, base = stub_server
+
+    with pytest.raises(HttpToolError, match="timed out"):
+        client.execute({"url": base + "/hang", "timeout": 0.2}, {})
+
+
+def test_null_timeout_disables_it(stub_server, client):
+    _, base = stub_server
+
+    result = client.execute({"url": base + "/paced", "timeout": None}, {})
+
+    assert result["path"] == "/paced"
+
+
+@pytest.mark.parametrize("timeout", ["3", 0, -1, True])
+def test_invalid_timeout_rejected_before_sending(stub_server, client, timeout):
+    server, base = stub_server
+
+    with pytest.raises(HttpToolError, match="timeout"):
+        client.execute({"url": base + "/review", "method": "POST", "timeout": timeout}, {})
+
+    assert server.requests == []
+
+
+def test_host_not_in_allowlist_is_refused(stub_server, client):
+    server, base = stub_server
+    other = base.replace("127.0.0.1", "localhost")
+
+    with pytest.raises(HttpToolError, match="WORKFLOW_HTTP_ALLOWED_HOSTS"):
+        client.execute({"url": other + "/plain"}, {})
+    unconfigured = HttpToolClient()
+    try:
+        with pytest.raises(HttpToolError):
+            unconfigured.execute({"url": base + "/plain"}, {})
+    finally:
+        unconfigured.close()
+
+    assert server.requests == []
+
+
+def test_wildcard_allows_any_host(stub_server):
+    _, base = stub_server
+    client = HttpToolClient(allowed_hosts=["*"])
+
+    try:
+        result = client.execute({"url": base.replace("127.0.0.1", "localhost") + "/plain"}, {})
+    finally:
+        client.close()
+
+    assert result["path"] == "/plain"
+
+
+def test_close_fails_pending_requests(stub_server):
+    _, base = stub_server
+    client = HttpToolClient(timeout=5.0, allowed_hosts=["127.0.0.1"])
+    errors = []
+
+    def call():
+        try:
+            client.execute({"url": base + "/hang"}, {})
+        except HttpToolError as e:
+            errors.append(e)
+
+    caller = threading.Thread(target=call)
+    caller.start()
+    time.sleep(0.2)
+    client.close()
+    caller.join(timeout=1)
+
+    assert not caller.is_alive()
+    assert len(errors) == 1
+
+
+def test_node_validation():
+    with pytest.raises(ValidationError):
+        Node(name="Tool", node_type=NodeType.FUNCTION)
+    with pytest.raises(ValidationError):
+        Node(name="Call", node_type=NodeType.HTTP)
+
+    with pytest.raises(ValidationError):
+        Node(name="Call", node_type=NodeType.HTTP, config={"url": "http://localhost/", "timeout": "3"})
+
+    Node(name="Call", node_type=NodeType.HTTP, config={"url": "http://localhost/"})
+    Node(name="Call", node_type=NodeType.HTTP, config={"url": "http://localhost/", "timeout": None})